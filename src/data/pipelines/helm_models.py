@@ -7,20 +7,20 @@ from typing import List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-import requests
 
+from src.data.pipelines.profiling import DataProfiler
 from src.utils.constant import (
     HELM_MODEL_FILE_PREFIX,
     HELM_MODEL_URL,
     HELM_REPO_MAIN,
+    HELM_TAG_SUFFIX,
     LOCAL_PATH_TO_INT_DATA,
     LOCAL_PATH_TO_RAW_DATA,
 )
 from src.utils.git import get_current_git_commit_short
 from src.utils.io.protected_folder import ProtectedFolder
-from src.utils.io.text import save_to_text
 from src.utils.io.yaml import load_from_yaml
-from src.utils.web import get_html_content_from_url
+from src.utils.web import download_to_file, get_json_from_url
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -37,21 +37,19 @@ class HelmModels:
     def get_raw_data(self) -> None:
         """Scrape webpage and save html"""
         # serialize to data/raw
-        response = requests.get(self.main_repo_url)
-        commit = response.json()["sha"][:7]
+        commit = get_json_from_url(self.main_repo_url)["sha"][:7]
         file_name = Path(LOCAL_PATH_TO_RAW_DATA) / self.file_name(
             type="raw", extension="yaml", commit=commit
         )
 
         logger.info(f"Saving url {self.url} to file {file_name}")
-        html_content = get_html_content_from_url(self.url)
         folder = ProtectedFolder(
             root_folder=LOCAL_PATH_TO_RAW_DATA, log_name="raw_data_log.json"
         )
         source = f"src/data/helm_models.py--{get_current_git_commit_short()}"
         folder.save_file(
-            save_function=save_to_text,
-            parameters={"file_name": file_name, "content": html_content},
+            save_function=download_to_file,
+            parameters={"file_name": file_name, "url": self.url},
             source=source,
         )
 
@@ -121,10 +119,11 @@ class HelmModels:
         )
         df_helm.to_parquet(path=output_file_path)
         logger.info(f"Saved formatted Dataframe to {output_file_path}")
+        DataProfiler().save_profile(df_helm, output_file_path)
 
     @staticmethod
     def tag_columns(df: pd.DataFrame) -> List:
-        return [col for col in df.columns if col.endswith("_TAG")]
+        return [col for col in df.columns if col.endswith(HELM_TAG_SUFFIX)]
 
     @staticmethod
     def truncate_description(text):
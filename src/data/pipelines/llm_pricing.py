@@ -3,8 +3,6 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-import requests
-
 from src.utils.constant import (
     LLMPRICING_API,
     LLMPRICING_FILE_PREFIX,
@@ -13,8 +11,7 @@ from src.utils.constant import (
 )
 from src.utils.git import get_current_git_commit_short
 from src.utils.io.protected_folder import ProtectedFolder
-from src.utils.io.text import save_to_text
-from src.utils.web import get_html_content_from_url
+from src.utils.web import download_to_file, get_json_from_url
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -29,21 +26,19 @@ class LLMPricing:
         self.api_path = LLMPRICING_API
 
     def get_raw_data(self) -> None:
-        response = requests.get(self.api_path)
-        commit = response.json()["sha"][:7]
+        commit = get_json_from_url(self.api_path)["sha"][:7]
         file_name = Path(LOCAL_PATH_TO_RAW_DATA) / self.file_name(
             type="raw", extension="ts", commit=commit
         )
 
         logger.info(f"Saving url {self.url} to file {file_name}")
-        html_content = get_html_content_from_url(self.url)
         folder = ProtectedFolder(
             root_folder=LOCAL_PATH_TO_RAW_DATA, log_name="raw_data_log.json"
         )
         source = f"{Path(__file__)}--{get_current_git_commit_short()}"
         folder.save_file(
-            save_function=save_to_text,
-            parameters={"file_name": file_name, "content": html_content},
+            save_function=download_to_file,
+            parameters={"file_name": file_name, "url": self.url},
             source=source,
         )
 
@@ -0,0 +1,313 @@
+import glob
+import logging
+from functools import reduce
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from src.utils.constant import (
+    HELM_TAG_SUFFIX,
+    LOCAL_PATH_TO_INT_DATA,
+    PROFILE_FILE_SUFFIX,
+    PROFILE_MAX_CATEGORIES,
+    PROFILE_QUANTILES,
+    PROFILE_SOURCES,
+)
+from src.utils.io.pickle import load_from_pickle, save_to_pickle
+from src.utils.sketch import HyperLogLog, QuantileSketch
+
+logging.basicConfig(
+    level=logging.DEBUG,
+    format="%(asctime)s %(levelname)s %(filename)s--l.%(lineno)d: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+class ColumnProfile:
+    """Mergeable summary statistics of a single column
+
+    Distinct counts use a HyperLogLog sketch and quantiles a QuantileSketch, so
+    that profiles of different snapshots can be merged without reading the data
+    again. Exact value counts are kept as long as there are at most
+    PROFILE_MAX_CATEGORIES distinct values; distinct counts and quantiles are then
+    exact too. If the column changes kind of dtype between snapshots (e.g. from
+    numeric to datetime), min, max, mean and quantiles are dropped rather than
+    compared across types.
+    """
+
+    def __init__(self, dtype: str = "", n_nulls: int = 0) -> None:
+        self.dtypes: Set[str] = {dtype} if dtype else set()
+        self.kinds: Set[str] = set()
+        self.count = 0
+        self.n_nulls = n_nulls
+        self.hll = HyperLogLog()
+        self.quantiles: Optional[QuantileSketch] = None
+        self.min: Any = None
+        self.max: Any = None
+        self.sum: Optional[float] = None
+        self.value_counts: Optional[Dict[Any, int]] = {}
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> "ColumnProfile":
+        profile = cls(dtype=str(series.dtype), n_nulls=int(series.isna().sum()))
+        values = series.dropna()
+        profile.count = len(values)
+        profile.hll.add(values)
+        # An all-null column (object dtype) says nothing about the kind of values
+        profile.kinds = {cls.dtype_kind(values)} if profile.count > 0 else set()
+        if pd.api.types.is_numeric_dtype(values):
+            numbers = values.astype(np.float64)
+            profile.quantiles = QuantileSketch()
+            profile.quantiles.add(numbers.to_numpy())
+            profile.sum = float(numbers.sum())
+        if len(values) > 0 and (
+            pd.api.types.is_numeric_dtype(values)
+            or pd.api.types.is_datetime64_any_dtype(values)
+        ):
+            profile.min = values.min()
+            profile.max = values.max()
+        try:
+            counts = values.value_counts()
+        except TypeError:
+            # Unhashable values, e.g. lists
+            counts = values.astype(str).value_counts()
+        if len(counts) <= PROFILE_MAX_CATEGORIES:
+            profile.value_counts = {
+                key.item() if isinstance(key, np.generic) else key: int(count)
+                for key, count in counts.items()
+            }
+        else:
+            profile.value_counts = None
+        return profile
+
+    def merge(self, other: "ColumnProfile") -> "ColumnProfile":
+        merged = ColumnProfile(n_nulls=self.n_nulls + other.n_nulls)
+        merged.dtypes = self.dtypes | other.dtypes
+        merged.kinds = self.kinds | other.kinds
+        merged.count = self.count + other.count
+        merged.hll = self.hll.merge(other.hll)
+        if len(merged.kinds) <= 1:
+            merged.quantiles = self._merge_optional(
+                self.quantiles, other.quantiles, lambda a, b: a.merge(b)
+            )
+            merged.sum = self._merge_optional(self.sum, other.sum, lambda a, b: a + b)
+            merged.min = self._merge_optional(self.min, other.min, min)
+            merged.max = self._merge_optional(self.max, other.max, max)
+        else:
+            logger.warning(
+                f"Column with dtypes {sorted(merged.dtypes)}: "
+                "skipping min, max, mean and quantiles"
+            )
+        if self.value_counts is None or other.value_counts is None:
+            merged.value_counts = None
+        else:
+            merged.value_counts = {
+                key: self.value_counts.get(key, 0) + other.value_counts.get(key, 0)
+                for key in self.value_counts.keys() | other.value_counts.keys()
+            }
+            if len(merged.value_counts) > PROFILE_MAX_CATEGORIES:
+                merged.value_counts = None
+        return merged
+
+    @staticmethod
+    def dtype_kind(series: pd.Series) -> str:
+        """Dtypes of the same kind (e.g. int64 and float64) are merged together"""
+        if pd.api.types.is_numeric_dtype(series):
+            return "numeric"
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return "datetime"
+        return "other"
+
+    @staticmethod
+    def _merge_optional(a: Any, b: Any, merge_function: callable) -> Any:
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return merge_function(a, b)
+
+    def exact_quantile(self, q: float) -> float:
+        """Quantile computed from the value counts, same rank as QuantileSketch"""
+        rank = q * (self.count - 1)
+        seen = 0
+        for value in sorted(self.value_counts):
+            seen += self.value_counts[value]
+            if seen > rank:
+                return float(value)
+        return np.nan
+
+    def summary(self) -> Dict[str, Any]:
+        n_rows = self.count + self.n_nulls
+        exact = self.value_counts is not None
+        summary = {
+            "dtype": ", ".join(sorted(self.dtypes)),
+            "count": self.count,
+            "null_rate": self.n_nulls / n_rows if n_rows > 0 else np.nan,
+            "distinct": (
+                len(self.value_counts)
+                if exact
+                else min(round(self.hll.count()), self.count)
+            ),
+            "distinct_approx": not exact,
+            "min": self.min,
+            "max": self.max,
+            "mean": (
+                self.sum / self.count
+                if self.sum is not None and self.count > 0
+                else np.nan
+            ),
+        }
+        for q in PROFILE_QUANTILES:
+            if self.quantiles is None or self.count == 0:
+                value = np.nan
+            elif exact:
+                value = self.exact_quantile(q)
+            else:
+                value = self.quantiles.quantile(q)
+            summary[f"p{round(q * 100):02d}"] = value
+        summary["quantiles_approx"] = self.quantiles is not None and not exact
+        if self.value_counts:
+            top = sorted(self.value_counts.items(), key=lambda x: -x[1])[:5]
+            summary["top_values"] = ", ".join(f"{key} ({count})" for key, count in top)
+        else:
+            summary["top_values"] = ""
+        return summary
+
+
+class DataProfile:
+    """Column profiles of one or several snapshots of the same source"""
+
+    # Bump when the pickled layout changes, so that stored profiles are recomputed
+    version = 3
+
+    def __init__(self) -> None:
+        self.format_version = self.version
+        self.n_rows = 0
+        self.snapshots: List[str] = []
+        self.columns: Dict[str, ColumnProfile] = {}
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, snapshot: str = "") -> "DataProfile":
+        profile = cls()
+        profile.n_rows = len(df)
+        profile.snapshots = [snapshot]
+        profile.columns = {
+            column: ColumnProfile.from_series(df[column]) for column in df.columns
+        }
+        return profile
+
+    def merge(self, other: "DataProfile") -> "DataProfile":
+        merged = DataProfile()
+        merged.n_rows = self.n_rows + other.n_rows
+        merged.snapshots = self.snapshots + other.snapshots
+        for column in list(self.columns) + [
+            col for col in other.columns if col not in self.columns
+        ]:
+            # A column missing from a snapshot counts as nulls for its rows
+            merged.columns[column] = self.columns.get(
+                column, ColumnProfile(n_nulls=self.n_rows)
+            ).merge(other.columns.get(column, ColumnProfile(n_nulls=other.n_rows)))
+        return merged
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame.from_dict(
+            {column: profile.summary() for column, profile in self.columns.items()},
+            orient="index",
+        )
+
+    def tag_frequencies(self) -> pd.Series:
+        """Share of rows with each HELM tag, for one-hot encoded tag columns"""
+        return pd.Series(
+            {
+                column: profile.sum / (profile.count + profile.n_nulls)
+                for column, profile in self.columns.items()
+                if column.endswith(HELM_TAG_SUFFIX) and profile.sum is not None
+            },
+            dtype=float,
+        ).sort_values(ascending=False)
+
+
+class DataProfiler:
+    """Profile intermediate snapshots and store the profiles next to the parquet files
+
+    Each snapshot is profiled once; reports over the history of a source are
+    merges of the stored profiles, so keeping them current costs O(new snapshots).
+    """
+
+    def __init__(self, folder: str = LOCAL_PATH_TO_INT_DATA) -> None:
+        self.folder = Path(folder)
+
+    @staticmethod
+    def profile_path(file_name: str) -> Path:
+        file_name = Path(file_name)
+        return file_name.with_name(f"{file_name.stem}{PROFILE_FILE_SUFFIX}")
+
+    def profile_snapshot(self, file_name: str, force: bool = False) -> DataProfile:
+        """
+        Profile of a parquet snapshot, computed only if not stored already
+
+        Args:
+            file_name (str): path to the parquet file
+            force (bool): recompute the profile even if it is up to date
+
+        Returns:
+            DataProfile: profile of the snapshot
+        """
+        profile_path = self.profile_path(file_name)
+        if (
+            not force
+            and profile_path.exists()
+            and profile_path.stat().st_mtime >= Path(file_name).stat().st_mtime
+        ):
+            profile = load_from_pickle(file_name=profile_path)
+            if getattr(profile, "format_version", None) == DataProfile.version:
+                return profile
+        df = pd.read_parquet(file_name)
+        return self.save_profile(df, file_name)
+
+    def save_profile(self, df: pd.DataFrame, file_name: str) -> DataProfile:
+        """
+        Profile a dataframe and store the profile next to its parquet snapshot
+
+        Args:
+            df (pd.DataFrame): content of the snapshot, e.g. right after writing it
+            file_name (str): path to the parquet file
+
+        Returns:
+            DataProfile: profile of the snapshot
+        """
+        profile = DataProfile.from_dataframe(df, snapshot=Path(file_name).name)
+        profile_path = self.profile_path(file_name)
+        save_to_pickle(file_name=profile_path, content=profile)
+        logger.info(f"Saved profile of {file_name} to {profile_path}")
+        return profile
+
+    def profile_history(self, prefix: str) -> DataProfile:
+        """
+        Profile of all intermediate snapshots of a source
+
+        Args:
+            prefix (str): file prefix of the source, e.g. HELM_MODEL_FILE_PREFIX
+
+        Returns:
+            DataProfile: merged profile of all snapshots
+        """
+        file_pattern = self.folder / f"{prefix}_intermediate_*.parquet"
+        file_names = sorted(glob.glob(str(file_pattern)))
+        if not file_names:
+            raise FileNotFoundError(f"No intermediate snapshot matches {file_pattern}")
+        return reduce(
+            DataProfile.merge, (self.profile_snapshot(ff) for ff in file_names)
+        )
+
+
+if __name__ == "__main__":
+    profiler = DataProfiler()
+    for prefix in PROFILE_SOURCES:
+        profile = profiler.profile_history(prefix)
+        logger.info(
+            f"Profile of {prefix} over {len(profile.snapshots)} snapshots "
+            f"({profile.n_rows} rows):\n{profile.to_frame().to_string()}"
+        )
@@ -8,6 +8,7 @@ from typing import Optional, Tuple
 
 import pandas as pd
 
+from src.data.pipelines.profiling import DataProfiler
 from src.utils.constant import (
     LOCAL_PATH_TO_INT_DATA,
     LOCAL_PATH_TO_RAW_DATA,
@@ -139,6 +140,7 @@ class ScaleLeaderbord:
         )
         joined_table.to_parquet(path=output_file_path)
         logger.info(f"Saved formatted Dataframe to {output_file_path}")
+        DataProfiler().save_profile(joined_table, output_file_path)
 
     @staticmethod
     def remove_leading_number(text):
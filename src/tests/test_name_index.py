@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+
+import src.utils.name_index
+from src.utils.name_index import ModelNameIndex
+
+
+@pytest.fixture
+def index():
+    return ModelNameIndex(
+        {
+            "helm_models": ["gpt-4-0613", "gpt-3.5-turbo", "llama-2-70b", "opt"],
+            "scale_leaderboard": ["GPT-4o", "Claude 3 Opus", "Llama 3 70B"],
+        }
+    )
+
+
+def test_prefix(index):
+    assert index.prefix("GPT-4") == ["gpt-4-0613", "GPT-4o"]
+    assert index.prefix("mistral") == []
+
+
+def test_substring(index):
+    assert index.substring("70b") == ["Llama 3 70B", "llama-2-70b"]
+    # Shorter than a trigram
+    assert index.substring("op") == ["Claude 3 Opus", "opt"]
+
+
+def test_fuzzy(index):
+    assert index.fuzzy("lama-2-70b") == [("llama-2-70b", 1)]
+    assert index.fuzzy("claude 3 opsu", max_distance=1) == []
+    assert index.fuzzy("claude 3 opsu") == [("Claude 3 Opus", 2)]
+
+
+def test_fuzzy_short_query_without_shared_trigram(index):
+    assert index.fuzzy("xpy") == [("opt", 2)]
+
+
+def test_fuzzy_matches_full_scan(index):
+    queries = ["gtp-4", "llama-3-70b", "gpt-4-0163", "clade", "o"]
+    for query in queries:
+        expected = sorted(
+            (name, distance)
+            for key in index.keys
+            for name in index.spellings[key]
+            if (distance := index.levenshtein(index.normalize(query), key, 2)) <= 2
+        )
+        assert sorted(index.fuzzy(query)) == expected
+
+
+def test_groups_per_alphanumeric(index):
+    groups = index.groups_per_alphanumeric()
+    assert list(groups) == ["C", "G", "L", "O"]
+    assert groups["L"] == ["Llama 3 70B", "llama-2-70b"]
+
+
+def write_snapshot(folder, names):
+    file_name = folder / "helm_models_intermediate_2024-08-14_f520af5.parquet"
+    pd.DataFrame({"short_name": names}).to_parquet(file_name)
+    return file_name
+
+
+def test_from_snapshots_is_cached(tmp_path, monkeypatch):
+    file_name = write_snapshot(tmp_path, ["gpt-4", "opt"])
+    cache_folder = tmp_path / "cache"
+    index = ModelNameIndex.from_snapshots([file_name], cache_folder=cache_folder)
+    assert index.prefix("gpt") == ["gpt-4"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("snapshot read although the index is cached")
+
+    monkeypatch.setattr(src.utils.name_index.pd, "read_parquet", fail)
+    cached = ModelNameIndex.from_snapshots([file_name], cache_folder=cache_folder)
+    assert cached.prefix("gpt") == ["gpt-4"]
+
+
+def test_from_snapshots_rebuilds_when_snapshot_is_rewritten(tmp_path):
+    cache_folder = tmp_path / "cache"
+    file_name = write_snapshot(tmp_path, ["gpt-4", "opt"])
+    ModelNameIndex.from_snapshots([file_name], cache_folder=cache_folder)
+    # Same file name, same number of characters
+    write_snapshot(tmp_path, ["gpt-5", "opt"])
+    index = ModelNameIndex.from_snapshots([file_name], cache_folder=cache_folder)
+    assert index.prefix("gpt") == ["gpt-5"]
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+import src.data.pipelines.profiling
+from src.data.pipelines.profiling import DataProfile, DataProfiler
+
+
+def test_merge_with_missing_column():
+    a = DataProfile.from_dataframe(pd.DataFrame({"x": [1, 2], "y": ["a", "b"]}))
+    b = DataProfile.from_dataframe(pd.DataFrame({"x": [3, None, 5]}))
+    report = a.merge(b).to_frame()
+    assert report.loc["x", "count"] == 4
+    assert report.loc["x", "min"] == 1
+    assert report.loc["x", "max"] == 5
+    # Rows of the snapshot without column y count as nulls
+    assert report.loc["y", "count"] == 2
+    assert report.loc["y", "null_rate"] == 3 / 5
+    assert report.loc["y", "distinct"] == 2
+
+
+def test_merge_with_changed_dtype():
+    a = DataProfile.from_dataframe(pd.DataFrame({"x": [1, 2]}))
+    b = DataProfile.from_dataframe(
+        pd.DataFrame({"x": pd.to_datetime(["2024-08-07", "2024-08-14"])})
+    )
+    summary = a.merge(b).columns["x"].summary()
+    assert summary["count"] == 4
+    assert len(summary["dtype"].split(", ")) == 2
+    assert summary["min"] is None
+    assert pd.isna(summary["p50"])
+
+
+def test_summary_of_tag_columns_is_exact():
+    profile = DataProfile.from_dataframe(pd.DataFrame({"A_TAG": [0, 1, 1, 1]}))
+    summary = profile.columns["A_TAG"].summary()
+    assert summary["p50"] == 1
+    assert summary["p95"] == 1
+    assert not summary["quantiles_approx"]
+    assert profile.tag_frequencies()["A_TAG"] == 0.75
+
+
+def test_distinct_estimate_clamped_to_count():
+    names = pd.Series([f"model-{i}" for i in range(300)])
+    summary = (
+        DataProfile.from_dataframe(pd.DataFrame({"name": names}))
+        .columns["name"]
+        .summary()
+    )
+    assert summary["distinct_approx"]
+    assert summary["distinct"] <= summary["count"]
+
+
+def test_profile_snapshot_skips_up_to_date_profile(tmp_path, monkeypatch):
+    file_name = tmp_path / "helm_models_intermediate_2024-08-14_f520af5.parquet"
+    pd.DataFrame({"x": [1, 2, 3]}).to_parquet(file_name)
+    profiler = DataProfiler(folder=tmp_path)
+    profile = profiler.profile_snapshot(file_name)
+    assert profiler.profile_path(file_name).exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("snapshot read although its profile is up to date")
+
+    monkeypatch.setattr(src.data.pipelines.profiling.pd, "read_parquet", fail)
+    cached = profiler.profile_snapshot(file_name)
+    assert cached.n_rows == profile.n_rows == 3
+    assert profiler.profile_history("helm_models").n_rows == 3
+
+
+def test_merge_int_and_float_snapshots():
+    a = DataProfile.from_dataframe(pd.DataFrame({"x": np.arange(100)}))
+    b = DataProfile.from_dataframe(pd.DataFrame({"x": np.arange(100).astype(float)}))
+    summary = a.merge(b).columns["x"].summary()
+    assert summary["distinct_approx"]
+    # Same values: the merged estimate is the one of a single snapshot
+    assert summary["distinct"] == a.columns["x"].summary()["distinct"]
+    assert abs(summary["distinct"] - 100) <= 5
+
+
+def test_merge_with_all_null_snapshot():
+    a = DataProfile.from_dataframe(pd.DataFrame({"x": [1.0, 2.0, 3.0]}))
+    b = DataProfile.from_dataframe(
+        pd.DataFrame({"x": pd.Series([None, None], dtype=object)})
+    )
+    summary = a.merge(b).columns["x"].summary()
+    assert summary["count"] == 3
+    assert summary["null_rate"] == 2 / 5
+    assert summary["min"] == 1.0
+    assert summary["max"] == 3.0
+    assert summary["p50"] == 2.0
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.sketch import HyperLogLog, QuantileSketch
+
+
+def test_hyperloglog_accuracy():
+    hll = HyperLogLog()
+    hll.add(pd.Series(np.arange(100_000)))
+    assert abs(hll.count() - 100_000) / 100_000 < 0.05
+
+
+def test_hyperloglog_small_cardinality():
+    hll = HyperLogLog()
+    hll.add(pd.Series(["a", "b", "c", "a"]))
+    assert round(hll.count()) == 3
+
+
+def test_hyperloglog_merge():
+    a, b, both = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    a.add(pd.Series(np.arange(0, 60_000)))
+    b.add(pd.Series(np.arange(40_000, 100_000)))
+    both.add(pd.Series(np.arange(100_000)))
+    merged = a.merge(b)
+    # Merging is exact: same registers as a sketch of the union
+    np.testing.assert_array_equal(merged.registers, both.registers)
+    assert abs(merged.count() - 100_000) / 100_000 < 0.05
+
+
+def test_quantile_sketch_relative_error():
+    values = np.random.default_rng(0).lognormal(size=100_000) - 0.5
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    sketch.add(values)
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        expected = np.sort(values)[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - expected) <= 0.01 * abs(expected) + 1e-12
+
+
+def test_quantile_sketch_merge_is_exact():
+    values = np.random.default_rng(1).normal(size=10_000)
+    a, b, both = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    a.add(values[:3_000])
+    b.add(values[3_000:])
+    both.add(values)
+    merged = a.merge(b)
+    for q in np.linspace(0, 1, 21):
+        assert merged.quantile(q) == both.quantile(q)
+
+
+def test_quantile_sketch_clamped_to_min_max():
+    sketch = QuantileSketch()
+    sketch.add(np.array([0.5, 1, 1, 1, 3]))
+    assert sketch.quantile(0) == 0.5
+    assert sketch.quantile(1) == 3.0
+    for q in np.linspace(0, 1, 11):
+        assert 0.5 <= sketch.quantile(q) <= 3.0
+
+
+def test_hyperloglog_hash_ignores_dtype():
+    ints, floats = HyperLogLog(), HyperLogLog()
+    ints.add(pd.Series(np.arange(100)))
+    floats.add(pd.Series(np.arange(100).astype(float)))
+    np.testing.assert_array_equal(ints.registers, floats.registers)
+
+    seconds, nanoseconds = HyperLogLog(), HyperLogLog()
+    dates = pd.Series(pd.to_datetime(["2024-08-07", "2024-08-14"]))
+    seconds.add(dates.astype("datetime64[s]"))
+    nanoseconds.add(dates.astype("datetime64[ns]"))
+    np.testing.assert_array_equal(seconds.registers, nanoseconds.registers)
@@ -0,0 +1,220 @@
+import io
+
+import pytest
+import requests
+
+import src.utils.web
+from src.utils.web import FetchPolicy
+
+URL = "https://example.com/file.yaml"
+
+
+class FailingStream(io.BytesIO):
+    """Body that drops the connection after fail_after bytes"""
+
+    def __init__(self, content: bytes, fail_after: int) -> None:
+        super().__init__(content)
+        self.fail_after = fail_after
+
+    def read(self, size: int = -1) -> bytes:
+        if self.tell() >= self.fail_after:
+            raise requests.exceptions.ConnectionError("connection dropped")
+        size = self.fail_after - self.tell() if size < 0 else size
+        return super().read(min(size, self.fail_after - self.tell()))
+
+
+class FakeSession:
+    """Replays queued responses and records the headers of every request"""
+
+    def __init__(self, responses) -> None:
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, stream=False, timeout=None):
+        self.requests.append(dict(headers or {}))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        response.url = url
+        return response
+
+
+def make_response(status_code=200, content=b"", headers=None, raw=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = "reason"
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(content) if raw is None else raw
+    return response
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(src.utils.web.time, "sleep", delays.append)
+    return delays
+
+
+def test_retry_after_on_429(sleeps):
+    session = FakeSession(
+        [make_response(429, headers={"Retry-After": "7"}), make_response(200, b"ok")]
+    )
+    response = FetchPolicy(session=session).get(URL)
+    assert response.content == b"ok"
+    assert sleeps == [7.0]
+
+
+def test_primary_rate_limit_on_403(sleeps, monkeypatch):
+    monkeypatch.setattr(src.utils.web.time, "time", lambda: 1000.0)
+    session = FakeSession(
+        [
+            make_response(
+                403,
+                headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1010"},
+            ),
+            make_response(200, b"ok"),
+        ]
+    )
+    FetchPolicy(session=session).get(URL)
+    assert sleeps == [11.0]
+
+
+def test_secondary_rate_limit_on_403(sleeps):
+    session = FakeSession(
+        [make_response(403, headers={"Retry-After": "3"}), make_response(200, b"ok")]
+    )
+    FetchPolicy(session=session).get(URL)
+    assert sleeps == [3.0]
+
+
+def test_403_without_rate_limit_headers_is_not_retried(sleeps):
+    session = FakeSession([make_response(403)])
+    with pytest.raises(requests.exceptions.HTTPError):
+        FetchPolicy(session=session).get(URL)
+    assert sleeps == []
+
+
+def test_give_up_after_max_retries(sleeps):
+    session = FakeSession([make_response(503) for _ in range(3)])
+    with pytest.raises(requests.exceptions.HTTPError):
+        FetchPolicy(max_retries=2, session=session).get(URL)
+    assert len(session.requests) == 3
+    assert len(sleeps) == 2
+    assert all(0 <= delay <= 2 for delay in sleeps)
+
+
+def test_give_up_after_max_retries_on_connection_error(sleeps):
+    session = FakeSession([requests.exceptions.ConnectionError() for _ in range(2)])
+    with pytest.raises(requests.exceptions.ConnectionError):
+        FetchPolicy(max_retries=1, session=session).get(URL)
+    assert len(sleeps) == 1
+
+
+def test_download_resumes_with_range(tmp_path, sleeps):
+    content = b"0123456789"
+    session = FakeSession(
+        [
+            make_response(200, headers={"ETag": '"v1"'}, raw=FailingStream(content, 4)),
+            make_response(
+                206,
+                content=content[4:],
+                headers={"Content-Range": "bytes 4-9/10", "ETag": '"v1"'},
+            ),
+        ]
+    )
+    file_name = tmp_path / "file.yaml"
+    FetchPolicy(session=session).download_file(URL, file_name, chunk_size=2)
+    assert file_name.read_bytes() == content
+    assert not (tmp_path / "file.yaml.part").exists()
+    assert session.requests[0] == {"Accept-Encoding": "identity"}
+    assert session.requests[1] == {
+        "Accept-Encoding": "identity",
+        "Range": "bytes=4-",
+        "If-Range": '"v1"',
+    }
+
+
+def test_download_restarts_when_range_is_ignored(tmp_path, sleeps):
+    content = b"0123456789"
+    session = FakeSession(
+        [
+            make_response(200, raw=FailingStream(content, 4)),
+            make_response(200, content=content),
+        ]
+    )
+    file_name = tmp_path / "file.yaml"
+    FetchPolicy(session=session).download_file(URL, file_name, chunk_size=2)
+    assert file_name.read_bytes() == content
+
+
+def test_download_restarts_when_resumed_at_wrong_offset(tmp_path, sleeps):
+    content = b"0123456789"
+    session = FakeSession(
+        [
+            make_response(200, raw=FailingStream(content, 4)),
+            make_response(
+                206, content=content[2:], headers={"Content-Range": "bytes 2-9/10"}
+            ),
+            make_response(200, content=content),
+        ]
+    )
+    file_name = tmp_path / "file.yaml"
+    FetchPolicy(session=session).download_file(URL, file_name, chunk_size=2)
+    assert file_name.read_bytes() == content
+    assert "Range" not in session.requests[2]
+
+
+def test_download_range_not_satisfiable(tmp_path, sleeps):
+    content = b"0123456789"
+    session = FakeSession(
+        [
+            make_response(200, raw=FailingStream(content, 10)),
+            make_response(416, headers={"Content-Range": "bytes */10"}),
+        ]
+    )
+    file_name = tmp_path / "file.yaml"
+    FetchPolicy(session=session).download_file(URL, file_name, chunk_size=2)
+    assert file_name.read_bytes() == content
+
+
+def test_download_restarts_when_size_changed(tmp_path, sleeps):
+    content = b"0123456789"
+    session = FakeSession(
+        [
+            make_response(200, raw=FailingStream(content, 10)),
+            make_response(416, headers={"Content-Range": "bytes */6"}),
+            make_response(200, content=content[:6]),
+        ]
+    )
+    file_name = tmp_path / "file.yaml"
+    FetchPolicy(session=session).download_file(URL, file_name, chunk_size=2)
+    assert file_name.read_bytes() == content[:6]
+    assert "Range" not in session.requests[2]
+
+
+def test_download_does_not_replace_existing_file(tmp_path, sleeps):
+    file_name = tmp_path / "file.yaml"
+    file_name.write_bytes(b"protected")
+    session = FakeSession([make_response(200, content=b"new")])
+    with pytest.raises(FileExistsError):
+        FetchPolicy(session=session).download_file(URL, file_name)
+    assert file_name.read_bytes() == b"protected"
+    assert session.requests == []
+
+
+def test_download_shares_a_single_retry_budget(tmp_path, sleeps):
+    content = b"0123456789"
+    session = FakeSession(
+        [
+            requests.exceptions.ConnectionError(),
+            make_response(200, raw=FailingStream(content, 4)),
+            requests.exceptions.ConnectionError(),
+            make_response(206, content=content[4:]),
+        ]
+    )
+    with pytest.raises(requests.exceptions.ConnectionError):
+        FetchPolicy(max_retries=2, session=session).download_file(
+            URL, tmp_path / "file.yaml", chunk_size=2
+        )
+    assert len(session.requests) == 3
+    assert len(sleeps) == 2
@@ -1,5 +1,6 @@
 LOCAL_PATH_TO_RAW_DATA = "data/01_raw"
 LOCAL_PATH_TO_INT_DATA = "data/02_intermediate"
+LOCAL_PATH_TO_CACHE = "data/cache"
 
 PATH_TO_PRICING_IN_LLM_PRICING = "src/lib/data.ts"
 
@@ -18,9 +19,33 @@ SCALE_EVAL_MAPPING = {
 HELM_REPO_MAIN = "https://api.github.com/repos/stanford-crfm/helm/commits/main"
 HELM_MODEL_URL = "https://raw.githubusercontent.com/stanford-crfm/helm/main/src/helm/config/model_metadata.yaml"
 HELM_MODEL_FILE_PREFIX = "helm_models"
+HELM_COL_SHORT_NAME = "short_name"
+HELM_TAG_SUFFIX = "_TAG"
 
 LLMPRICING_URL = (
     "https://huggingface.co/spaces/philschmid/llm-pricing/raw/main/src/lib/data.ts"
 )
 LLMPRICING_API = "https://huggingface.co/api/spaces/philschmid/llm-pricing/"
 LLMPRICING_FILE_PREFIX = "llm_pricing"
+
+# Model name column of the intermediate snapshot of each source
+MODEL_NAME_COLUMNS = {
+    HELM_MODEL_FILE_PREFIX: HELM_COL_SHORT_NAME,
+    SCALE_LEADERBOARD_FILE_PREFIX: SCALE_COL_MODEL,
+}
+MODEL_NAME_INDEX_FILE_PREFIX = "model_name_index"
+
+# Profiling of intermediate snapshots
+PROFILE_FILE_SUFFIX = ".profile.pickle"
+PROFILE_MAX_CATEGORIES = 50
+PROFILE_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+PROFILE_SOURCES = (HELM_MODEL_FILE_PREFIX, SCALE_LEADERBOARD_FILE_PREFIX)
+
+# Fetch policy used by src/utils/web.py
+FETCH_TIMEOUT = (5.0, 30.0)  # (connect, read) in seconds
+FETCH_MAX_RETRIES = 5
+FETCH_BACKOFF_BASE = 1.0  # seconds
+FETCH_BACKOFF_MAX = 60.0  # seconds
+FETCH_RATE_LIMIT_MAX_WAIT = 900.0  # seconds
+FETCH_RETRY_STATUS = (429, 500, 502, 503, 504)
+FETCH_CHUNK_SIZE = 1024 * 1024  # bytes
@@ -0,0 +1,254 @@
+import bisect
+import glob
+import hashlib
+import logging
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from src.utils.constant import (
+    LOCAL_PATH_TO_CACHE,
+    LOCAL_PATH_TO_INT_DATA,
+    MODEL_NAME_COLUMNS,
+    MODEL_NAME_INDEX_FILE_PREFIX,
+)
+from src.utils.io.pickle import load_from_pickle, save_to_pickle
+from src.utils.path import get_shasum
+
+logging.basicConfig(
+    level=logging.DEBUG,
+    format="%(asctime)s %(levelname)s %(filename)s--l.%(lineno)d: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+class ModelNameIndex:
+    """In-memory index of model names, supporting prefix, substring and fuzzy lookup
+
+    Names are normalized (stripped, lowercase) before indexing; lookups return the
+    original spellings. Prefix lookups bisect a sorted list of keys, substring and
+    fuzzy lookups go through a trigram inverted index.
+    """
+
+    # Bump when the pickled layout changes, to invalidate cached indexes
+    version = 1
+
+    def __init__(self, names: Optional[Dict[str, Iterable[str]]] = None) -> None:
+        """
+        Args:
+            names (Optional[Dict[str, Iterable[str]]]): model names for each source,
+                e.g. {"helm_models": [...], "scale_leaderboard": [...]}
+        """
+        self.spellings: Dict[str, Set[str]] = defaultdict(set)
+        self.sources: Dict[str, Set[str]] = defaultdict(set)
+        for source, source_names in (names or {}).items():
+            for name in source_names:
+                if not isinstance(name, str) or not name.strip():
+                    continue
+                self.spellings[self.normalize(name)].add(name)
+                self.sources[name].add(source)
+        self.keys: List[str] = sorted(self.spellings)
+        self.trigrams: Dict[str, Set[int]] = defaultdict(set)
+        for i, key in enumerate(self.keys):
+            for trigram in self.get_trigrams(key, padded=True):
+                self.trigrams[trigram].add(i)
+        # Plain dicts so that the index pickles without lambdas
+        self.spellings = dict(self.spellings)
+        self.sources = dict(self.sources)
+        self.trigrams = dict(self.trigrams)
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        return name.strip().lower()
+
+    @staticmethod
+    def get_trigrams(text: str, padded: bool = False) -> Set[str]:
+        if padded:
+            text = f"  {text} "
+        return {text[i : i + 3] for i in range(len(text) - 2)}
+
+    def prefix(self, query: str) -> List[str]:
+        """Names starting with query (case-insensitive)"""
+        query = self.normalize(query)
+        start = bisect.bisect_left(self.keys, query)
+        end = bisect.bisect_left(self.keys, query + "\uffff", lo=start)
+        return self._names(self.keys[start:end])
+
+    def substring(self, query: str) -> List[str]:
+        """Names containing query (case-insensitive)"""
+        query = self.normalize(query)
+        if len(query) < 3:
+            # No trigram to narrow down the search; the key list is small
+            return self._names([key for key in self.keys if query in key])
+        postings = sorted(
+            (self.trigrams.get(trigram, set()) for trigram in self.get_trigrams(query)),
+            key=len,
+        )
+        candidates = set.intersection(*postings)
+        keys = [self.keys[i] for i in sorted(candidates)]
+        return self._names([key for key in keys if query in key])
+
+    def fuzzy(self, query: str, max_distance: int = 2) -> List[Tuple[str, int]]:
+        """
+        Names within max_distance edits of query (case-insensitive)
+
+        Args:
+            query (str): possibly misspelled model name
+            max_distance (int): maximum Levenshtein distance
+
+        Returns:
+            List[Tuple[str, int]]: (name, distance), closest first
+        """
+        query = self.normalize(query)
+        query_trigrams = self.get_trigrams(query, padded=True)
+        # Each edit destroys at most 3 trigrams (q-gram lemma), so a match shares
+        # at least min_shared trigrams with the query
+        min_shared = len(query_trigrams) - 3 * max_distance
+        if min_shared <= 0:
+            # Short query: a match may share no trigram at all
+            candidates = range(len(self.keys))
+        else:
+            shared = defaultdict(int)
+            for trigram in query_trigrams:
+                for i in self.trigrams.get(trigram, ()):
+                    shared[i] += 1
+            candidates = [i for i, count in shared.items() if count >= min_shared]
+        matches = []
+        for i in candidates:
+            key = self.keys[i]
+            if abs(len(key) - len(query)) > max_distance:
+                continue
+            distance = self.levenshtein(query, key, max_distance)
+            if distance <= max_distance:
+                matches.extend((name, distance) for name in self._names([key]))
+        return sorted(matches, key=lambda x: (x[1], x[0]))
+
+    def search(self, query: str, max_distance: int = 2) -> List[str]:
+        """Prefix matches, then other substring matches, then fuzzy matches"""
+        results = self.prefix(query)
+        seen = set(results)
+        for name in self.substring(query) + [
+            name for name, _ in self.fuzzy(query, max_distance=max_distance)
+        ]:
+            if name not in seen:
+                results.append(name)
+                seen.add(name)
+        return results
+
+    def groups_per_alphanumeric(self) -> Dict[str, List[str]]:
+        """Names grouped by their first character, in uppercase"""
+        groups = defaultdict(list)
+        for name in sorted(self.sources):
+            groups[name[0].upper()].append(name)
+        return dict(sorted(groups.items()))
+
+    def _names(self, keys: Iterable[str]) -> List[str]:
+        return [name for key in keys for name in sorted(self.spellings[key])]
+
+    @staticmethod
+    def levenshtein(a: str, b: str, max_distance: int) -> int:
+        """Edit distance between a and b, or max_distance + 1 if it is larger"""
+        previous = list(range(len(b) + 1))
+        for i, char_a in enumerate(a, start=1):
+            current = [i]
+            for j, char_b in enumerate(b, start=1):
+                current.append(
+                    min(
+                        previous[j] + 1,
+                        current[j - 1] + 1,
+                        previous[j - 1] + (char_a != char_b),
+                    )
+                )
+            if min(current) > max_distance:
+                return max_distance + 1
+            previous = current
+        return previous[-1]
+
+    @classmethod
+    def from_dataframes(cls, frames: Dict[str, Tuple[pd.DataFrame, str]]):
+        """
+        Build an index from dataframes
+
+        Args:
+            frames (Dict[str, Tuple[pd.DataFrame, str]]): source -> (dataframe, column)
+        """
+        return cls(
+            {
+                source: df[column].dropna().unique()
+                for source, (df, column) in frames.items()
+            }
+        )
+
+    @classmethod
+    def from_snapshots(
+        cls,
+        file_names: Optional[List[str]] = None,
+        cache_folder: str = LOCAL_PATH_TO_CACHE,
+    ):
+        """
+        Build an index from intermediate parquet snapshots, or load it from the cache
+
+        The cache key depends on the snapshot file names and contents, and on the
+        index format version, so the index is built once per set of snapshots.
+
+        Args:
+            file_names (Optional[List[str]]): parquet files to index; if None, use
+                the most recent intermediate snapshot of each source in
+                MODEL_NAME_COLUMNS
+            cache_folder (str): folder where built indexes are pickled
+        """
+        if file_names is None:
+            file_names = cls.latest_snapshots()
+        file_names = sorted(str(ff) for ff in file_names)
+        cache_path = Path(cache_folder) / cls.cache_file_name(file_names)
+        if cache_path.exists():
+            logger.info(f"Loading model name index from {cache_path}")
+            return load_from_pickle(file_name=cache_path)
+
+        names = defaultdict(list)
+        for ff in file_names:
+            source = cls.get_source_from_path(ff)
+            column = MODEL_NAME_COLUMNS[source]
+            df = pd.read_parquet(ff, columns=[column])
+            names[source].extend(df[column].dropna().unique())
+        index = cls(names)
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        save_to_pickle(file_name=cache_path, content=index)
+        logger.info(f"Saved model name index ({len(index)} names) to {cache_path}")
+        return index
+
+    @staticmethod
+    def latest_snapshots(folder: str = LOCAL_PATH_TO_INT_DATA) -> List[str]:
+        """Most recent intermediate parquet file for each source in MODEL_NAME_COLUMNS"""
+        file_names = []
+        for source in MODEL_NAME_COLUMNS:
+            file_pattern = Path(folder) / f"{source}_intermediate_*.parquet"
+            # Names end with _<YYYY-MM-DD>[_<commit>]: sort on the date
+            candidates = sorted(
+                glob.glob(str(file_pattern)),
+                key=lambda ff: Path(ff).stem[len(f"{source}_intermediate_") :],
+            )
+            if candidates:
+                file_names.append(candidates[-1])
+        return file_names
+
+    @staticmethod
+    def get_source_from_path(path: str) -> str:
+        file_name = Path(path).name
+        for source in MODEL_NAME_COLUMNS:
+            if file_name.startswith(f"{source}_"):
+                return source
+        raise ValueError(f"No model name column known for {path}")
+
+    @classmethod
+    def cache_file_name(cls, file_names: List[str]) -> Path:
+        hasher = hashlib.sha1(f"v{cls.version};".encode())
+        for ff in file_names:
+            hasher.update(f"{Path(ff).name}:{get_shasum(ff)};".encode())
+        return Path(f"{MODEL_NAME_INDEX_FILE_PREFIX}_{hasher.hexdigest()[:12]}.pickle")
@@ -2,6 +2,8 @@ from collections import defaultdict
 
 import pandas as pd
 
+from src.utils.name_index import ModelNameIndex
+
 
 def print_dataframe_col_per_alphanumeric(df: pd.DataFrame, column: str):
     groups = defaultdict(list)
@@ -12,3 +14,14 @@ def print_dataframe_col_per_alphanumeric(df: pd.DataFrame, column: str):
     # Print the grouped entries
     for first_char, entries in sorted(groups.items()):
         print(f"{first_char} ({len(entries)}): {', '.join(entries)}")
+
+
+def print_names_per_alphanumeric(index: ModelNameIndex):
+    """Print all names of an index, grouped by first character
+
+    Args:
+        index (ModelNameIndex): e.g. ModelNameIndex.from_snapshots(), built once
+            per set of snapshots and cached on disk
+    """
+    for first_char, entries in index.groups_per_alphanumeric().items():
+        print(f"{first_char} ({len(entries)}): {', '.join(entries)}")
@@ -0,0 +1,175 @@
+import math
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+
+def hash_series(series: pd.Series) -> np.ndarray:
+    """
+    Deterministic 64-bit hash of every value of a series
+
+    The hash key is fixed, so hashes computed on different days can be merged.
+    Numbers are hashed as float64 and datetimes as int64 nanoseconds, so that the
+    hash depends on the value and not on the dtype (an int column becomes float64
+    as soon as it holds a null). Unhashable values (lists, dicts) are hashed
+    through their string representation.
+
+    Args:
+        series (pd.Series): values to hash, without nulls
+
+    Returns:
+        np.ndarray: uint64 hashes
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        series = series.astype(np.float64)
+    elif pd.api.types.is_datetime64_any_dtype(series):
+        if getattr(series.dtype, "tz", None) is not None:
+            series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+        series = pd.Series(series.to_numpy(dtype="datetime64[ns]").view(np.int64))
+    try:
+        hashes = pd.util.hash_pandas_object(series, index=False)
+    except TypeError:
+        hashes = pd.util.hash_pandas_object(series.astype(str), index=False)
+    return hashes.to_numpy(dtype=np.uint64)
+
+
+def bit_length(values: np.ndarray) -> np.ndarray:
+    """Vectorized int.bit_length for uint64 arrays"""
+    values = values.copy()
+    length = np.zeros(values.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        mask = values >= (np.uint64(1) << np.uint64(shift))
+        length[mask] += shift
+        values[mask] >>= np.uint64(shift)
+    return length + (values > 0)
+
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch (Flajolet et al., 2007)
+
+    Relative standard error is about 1.04 / sqrt(2**precision), i.e. 1.6% for the
+    default precision of 12 (4 KiB of registers).
+    """
+
+    def __init__(self, precision: int = 12) -> None:
+        self.precision = precision
+        self.registers = np.zeros(2**precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        if len(hashes) == 0:
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        n_bits = 64 - self.precision
+        idx = (hashes >> np.uint64(n_bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << n_bits) - 1)
+        rank = (n_bits - bit_length(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def add(self, series: pd.Series) -> None:
+        self.add_hashes(hash_series(series.dropna()))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError(
+                f"Cannot merge HyperLogLog of precision {self.precision} and {other.precision}"
+            )
+        merged = HyperLogLog(self.precision)
+        merged.registers = np.maximum(self.registers, other.registers)
+        return merged
+
+    def count(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m**2 / np.sum(2.0 ** -self.registers.astype(np.float64))
+        n_zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and n_zeros > 0:
+            # Small range correction: linear counting
+            estimate = m * math.log(m / n_zeros)
+        return float(estimate)
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with relative accuracy guarantees (DDSketch)
+
+    Values are counted in logarithmic buckets, so any quantile is returned within
+    a relative error of relative_accuracy, and merging two sketches is exact.
+    Returned quantiles are clamped to the exact min and max of the values added,
+    which are also returned as the 0 and 1 quantiles.
+    """
+
+    # Values with a smaller magnitude are counted as zeros
+    min_indexable = 1e-9
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def add(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        self.count += len(values)
+        if len(values) > 0:
+            self.min = min(self.min, float(values.min()))
+            self.max = max(self.max, float(values.max()))
+        is_zero = np.abs(values) < self.min_indexable
+        self.zero_count += int(np.count_nonzero(is_zero))
+        for buckets, selected in (
+            (self.positive, values[~is_zero & (values > 0)]),
+            (self.negative, -values[~is_zero & (values < 0)]),
+        ):
+            keys = np.ceil(np.log(selected) / math.log(self.gamma)).astype(np.int64)
+            for key, count in zip(*np.unique(keys, return_counts=True)):
+                buckets[int(key)] = buckets.get(int(key), 0) + int(count)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(
+                "Cannot merge quantile sketches of different relative accuracies"
+            )
+        merged = QuantileSketch(self.relative_accuracy)
+        for buckets, a, b in (
+            (merged.positive, self.positive, other.positive),
+            (merged.negative, self.negative, other.negative),
+        ):
+            for key in a.keys() | b.keys():
+                buckets[key] = a.get(key, 0) + b.get(key, 0)
+        merged.zero_count = self.zero_count + other.zero_count
+        merged.count = self.count + other.count
+        merged.min = min(self.min, other.min)
+        merged.max = max(self.max, other.max)
+        return merged
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return np.nan
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        return float(np.clip(self._quantile(q), self.min, self.max))
+
+    def _quantile(self, q: float) -> float:
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._bucket_value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._bucket_value(key)
+        return self._bucket_value(max(self.positive))
+
+    def _bucket_value(self, key: int) -> float:
+        return 2 * self.gamma**key / (self.gamma + 1)
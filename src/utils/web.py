@@ -1,24 +1,329 @@
-from typing import Any, Iterable
+import logging
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Iterable, Optional, Tuple, Union
 
 import requests
 from bs4 import BeautifulSoup
 
+from src.utils.constant import (
+    FETCH_BACKOFF_BASE,
+    FETCH_BACKOFF_MAX,
+    FETCH_CHUNK_SIZE,
+    FETCH_MAX_RETRIES,
+    FETCH_RATE_LIMIT_MAX_WAIT,
+    FETCH_RETRY_STATUS,
+    FETCH_TIMEOUT,
+)
 
-def get_html_content_from_url(url: str) -> str:
+logging.basicConfig(
+    level=logging.DEBUG,
+    format="%(asctime)s %(levelname)s %(filename)s--l.%(lineno)d: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+RETRY_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class FetchPolicy:
+    """Timeouts, retries and rate-limit handling for all outgoing HTTP calls
+
+    Transient failures (connection errors, timeouts, 429 and 5xx responses) are
+    retried with full-jitter exponential backoff. When the server says how long
+    to wait, through a Retry-After header or GitHub's X-RateLimit-* headers,
+    that delay is used instead, as long as it stays below rate_limit_max_wait.
+    """
+
+    def __init__(
+        self,
+        timeout: Union[float, Tuple[float, float]] = FETCH_TIMEOUT,
+        max_retries: int = FETCH_MAX_RETRIES,
+        backoff_base: float = FETCH_BACKOFF_BASE,
+        backoff_max: float = FETCH_BACKOFF_MAX,
+        rate_limit_max_wait: float = FETCH_RATE_LIMIT_MAX_WAIT,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limit_max_wait = rate_limit_max_wait
+        self.session = requests.Session() if session is None else session
+
+    def get(
+        self, url: str, headers: Optional[dict] = None, stream: bool = False
+    ) -> requests.Response:
+        """
+        GET a url, retrying transient failures
+
+        Args:
+            url (str): url to fetch
+            headers (Optional[dict]): extra request headers
+            stream (bool): do not download the body right away
+
+        Returns:
+            requests.Response: successful response (status < 400)
+        """
+        attempt = 0
+        while True:
+            response, delay = self._try_get(url, headers, stream, attempt)
+            if response is not None:
+                return response
+            time.sleep(delay)
+            attempt += 1
+
+    def _try_get(
+        self, url: str, headers: Optional[dict], stream: bool, attempt: int
+    ) -> Tuple[Optional[requests.Response], float]:
+        """
+        Single GET attempt
+
+        Returns:
+            Tuple[Optional[requests.Response], float]: successful response and 0,
+                or None and the delay before the next attempt. Raises once
+                attempt reaches max_retries.
+        """
+        try:
+            response = self.session.get(
+                url, headers=headers, stream=stream, timeout=self.timeout
+            )
+        except RETRY_EXCEPTIONS as e:
+            if attempt >= self.max_retries:
+                raise
+            delay = self.backoff_delay(attempt)
+            logger.warning(
+                f"{type(e).__name__} on {url} "
+                f"(attempt {attempt + 1}/{self.max_retries + 1}), "
+                f"retrying in {delay:.1f}s"
+            )
+            return None, delay
+        self.log_rate_limit(url, response)
+        if not self.should_retry(response):
+            response.raise_for_status()
+            return response, 0.0
+        delay = self.server_delay(response)
+        if delay is None:
+            delay = self.backoff_delay(attempt)
+        if attempt >= self.max_retries or delay > self.rate_limit_max_wait:
+            response.raise_for_status()
+        response.close()
+        logger.warning(
+            f"HTTP {response.status_code} on {url} "
+            f"(attempt {attempt + 1}/{self.max_retries + 1}), "
+            f"retrying in {delay:.1f}s"
+        )
+        return None, delay
+
+    def download_file(
+        self, url: str, file_name: str, chunk_size: int = FETCH_CHUNK_SIZE
+    ) -> None:
+        """
+        Stream a url to a file, resuming with HTTP Range requests after a failure
+
+        The body is written to <file_name>.part and renamed once complete. If the
+        server ignores the Range header, resumes at the wrong offset or the resource
+        changed in the meantime (If-Range on the ETag, or a different total length),
+        the download restarts from scratch. Content encoding is disabled so that the
+        offset, counted in bytes written to disk, matches the byte range of the body
+        sent by the server. Failed requests and dropped connections share a single
+        budget of max_retries retries.
+
+        Args:
+            url (str): url of the file to download
+            file_name (str): local path where the file is saved; must not exist,
+                so that files protected by ProtectedFolder are never replaced
+            chunk_size (int): size of the chunks written to disk, in bytes
+        """
+        file_path = Path(file_name)
+        if file_path.exists():
+            raise FileExistsError(f"{file_path} already exists")
+        part_path = file_path.with_name(f"{file_path.name}.part")
+        part_path.unlink(missing_ok=True)
+        etag = None
+        attempt = 0
+        while True:
+            offset = part_path.stat().st_size if part_path.exists() else 0
+            headers = {"Accept-Encoding": "identity"}
+            if offset > 0:
+                headers["Range"] = f"bytes={offset}-"
+                if etag is not None:
+                    headers["If-Range"] = etag
+            try:
+                response, delay = self._try_get(url, headers, True, attempt)
+            except requests.exceptions.HTTPError as e:
+                if offset == 0 or e.response is None or e.response.status_code != 416:
+                    raise
+                if self.range_total(e.response) == offset:
+                    # Range not satisfiable: the .part file already holds everything
+                    break
+                logger.info(f"Size of {url} changed, restarting")
+                part_path.unlink()
+                continue
+            if response is not None:
+                try:
+                    with response:
+                        etag = response.headers.get("ETag", etag)
+                        if offset > 0 and response.status_code != 206:
+                            logger.info(f"Server did not resume {url}, restarting")
+                            offset = 0
+                        elif offset > 0 and self.range_start(response) != offset:
+                            logger.info(
+                                f"Server resumed {url} at a wrong offset, restarting"
+                            )
+                            part_path.unlink()
+                            continue
+                        with open(part_path, "ab" if offset > 0 else "wb") as file:
+                            for chunk in response.iter_content(chunk_size=chunk_size):
+                                file.write(chunk)
+                    break
+                except RETRY_EXCEPTIONS as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = self.backoff_delay(attempt)
+                    size = part_path.stat().st_size if part_path.exists() else 0
+                    logger.warning(
+                        f"{type(e).__name__} while downloading {url} after {size} "
+                        f"bytes, resuming in {delay:.1f}s"
+                    )
+            time.sleep(delay)
+            attempt += 1
+        os.replace(part_path, file_path)
+
+    @staticmethod
+    def range_start(response: requests.Response) -> Optional[int]:
+        """First byte of a 206 response, from its Content-Range header"""
+        content_range = response.headers.get("Content-Range", "")
+        unit, _, byte_range = content_range.partition(" ")
+        if unit != "bytes":
+            return None
+        try:
+            return int(byte_range.split("-", 1)[0])
+        except ValueError:
+            return None
+
+    @staticmethod
+    def range_total(response: requests.Response) -> Optional[int]:
+        """Total length of the resource, from a Content-Range header like bytes */N"""
+        content_range = response.headers.get("Content-Range", "")
+        _, _, total = content_range.rpartition("/")
+        try:
+            return int(total)
+        except ValueError:
+            return None
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff, in seconds"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    @staticmethod
+    def should_retry(response: requests.Response) -> bool:
+        if response.status_code in FETCH_RETRY_STATUS:
+            return True
+        if response.status_code not in (403, 429):
+            return False
+        # GitHub answers 403 (not 429) when the primary rate limit is exhausted,
+        # and 403 or 429 with Retry-After for secondary rate limits
+        return (
+            response.headers.get("X-RateLimit-Remaining") == "0"
+            or "Retry-After" in response.headers
+        )
+
+    @staticmethod
+    def server_delay(response: requests.Response) -> Optional[float]:
+        """
+        Delay requested by the server through Retry-After or X-RateLimit-Reset
+
+        Args:
+            response (requests.Response): response to inspect
+
+        Returns:
+            Optional[float]: delay in seconds, None if the server did not say
+        """
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                try:
+                    date = parsedate_to_datetime(retry_after)
+                    return max(0.0, date.timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            reset = response.headers.get("X-RateLimit-Reset")
+            if reset is not None:
+                try:
+                    return max(0.0, float(reset) - time.time()) + 1.0
+                except ValueError:
+                    pass
+        return None
+
+    @staticmethod
+    def log_rate_limit(url: str, response: requests.Response) -> None:
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None:
+            limit = response.headers.get("X-RateLimit-Limit")
+            logger.debug(f"Rate limit for {url}: {remaining}/{limit} remaining")
+
+
+DEFAULT_FETCH_POLICY = FetchPolicy()
+
+
+def get_html_content_from_url(
+    url: str, policy: FetchPolicy = DEFAULT_FETCH_POLICY
+) -> str:
     """
     Scrape a webpage and return the html in Unicode
 
     Args:
         url (str): url of the website to scrape
+        policy (FetchPolicy): timeouts and retries to apply
 
     Returns:
         str: html of the webpage in Unicode
     """
-    response = requests.get(url)
+    response = policy.get(url)
     html_content = response.text
     return html_content
 
 
+def get_json_from_url(url: str, policy: FetchPolicy = DEFAULT_FETCH_POLICY) -> Any:
+    """
+    Query a JSON API, e.g. the GitHub or HuggingFace API
+
+    Args:
+        url (str): url of the API endpoint
+        policy (FetchPolicy): timeouts and retries to apply
+
+    Returns:
+        Any: decoded JSON
+    """
+    response = policy.get(url)
+    return response.json()
+
+
+def download_to_file(
+    file_name: str, url: str, policy: FetchPolicy = DEFAULT_FETCH_POLICY
+) -> None:
+    """
+    Download a (possibly large) file, resuming after dropped connections.
+    Signature matches the save functions used with ProtectedFolder.save_file
+
+    Args:
+        file_name (str): local path where the file is saved
+        url (str): url of the file to download
+        policy (FetchPolicy): timeouts and retries to apply
+    """
+    policy.download_file(url=url, file_name=file_name)
+
+
 def find_section_from_html(html_content: str, name: str, class_: str) -> Iterable[Any]:
     """
     Find specific sections inside a html page in Unicode format